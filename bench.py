@@ -0,0 +1,105 @@
+import contextlib
+import copy
+import io
+import json
+import time
+from typing import *
+
+from components import DaemonDescriptions
+from host import Host
+from inventory import Inventory
+from mgr import Mgr
+
+
+def age(snapshot: dict, seconds: float, keep_last_update=True) -> str:
+    """
+    Pretend `snapshot` was taken `seconds` ago
+    """
+    snapshot = copy.deepcopy(snapshot)
+    snapshot['created'] -= seconds
+    for components in snapshot['hosts'].values():
+        for items in components.values():
+            for item in items:
+                if keep_last_update and item.get('last_update'):
+                    item['last_update'] -= seconds
+                else:
+                    item.pop('last_update', None)
+    return json.dumps(snapshot)
+
+
+def restore(store: dict) -> Tuple[float, Mgr, Inventory]:
+    standby = Mgr()
+    standby._store = store
+    start = time.time()
+    inventory = Inventory(mgr=standby)
+    return time.time() - start, standby, inventory
+
+
+def failover(hosts=100, snapshot_age=None):
+    """
+    Measures how long a standby mgr needs until its inventory is ready.
+
+    The active mgr runs with `hosts` additional hosts and takes a snapshot.
+    The standby shares the mon_store with it and restores from that snapshot,
+    which is `snapshot_age` seconds old (defaults to the `snapshot_interval`,
+    the worst case). Only the components older than their `refresh_interval`
+    are re-sourced.
+
+    For comparison, the same restore where every component is stale. That's what
+    a replay of the per-host namespaces amounts to.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        active = Mgr()
+        inventory = Inventory(mgr=active)
+        for i in range(hosts):
+            inventory.add_host(Host(hostname=f"host-{i}", mgr=active))
+        inventory.maybe_save_snapshot()
+        if snapshot_age is None:
+            snapshot_age = inventory.snapshot_interval
+        snapshot = json.loads(active._store[inventory.snapshot_namespace()])
+
+        aged = dict(active._store)
+        aged[inventory.snapshot_namespace()] = age(snapshot, snapshot_age)
+        ready, standby, restored = restore(aged)
+
+        stale = dict(active._store)
+        stale[inventory.snapshot_namespace()] = age(snapshot, snapshot_age, keep_last_update=False)
+        stale_ready, cold, _ = restore(stale)
+
+    def sourced(mgr):
+        return mgr.result_cache.hits + mgr.result_cache.misses
+
+    collections = len(list(restored.hosts)) * len(Host.storable_components)
+    print(f"hosts: {len(list(restored.hosts))} (snapshot generation {restored.generation}, "
+          f"{snapshot_age}s old)")
+    print(f"failover-to-ready (snapshot): {ready * 1000:.1f}ms, "
+          f"collections re-sourced: {sourced(standby)}/{collections}, "
+          f"cephadm calls: {standby.result_cache.misses}")
+    print(f"failover-to-ready (everything stale): {stale_ready * 1000:.1f}ms, "
+          f"collections re-sourced: {sourced(cold)}/{collections}, "
+          f"cephadm calls: {cold.result_cache.misses}")
+
+
+def steady_state(daemons=100):
+    """
+    Re-sourcing unchanged data must not produce any changes.
+
+    A collection loaded from json (store or snapshot) is reconciled twice with the
+    same sourced data. The first pass takes over what source() provides, the
+    second one has to come back empty.
+    """
+    data = [{'daemon_id': f"osd.{i}", 'daemon_type': 'osd'} for i in range(daemons)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaded = DaemonDescriptions.from_json(
+            [dict(d, etc='stale', key1='val', last_update=1) for d in data], 'host-0')
+        first = loaded.reconcile(DaemonDescriptions.source('host-0', data))
+        second = loaded.reconcile(DaemonDescriptions.source('host-0', data))
+    print(f"reconcile after load: {first}, unchanged re-source: {second}")
+    assert len(first.modified) == daemons
+    assert not second, "re-sourcing unchanged data reported changes"
+    assert all(d.etc is None for d in loaded)
+
+
+if __name__ == '__main__':
+    steady_state()
+    failover()
@@ -16,6 +16,13 @@ class Component:
     # data that could lead to issues if getting stale.
     loadable_fields = [] + loadable_base_fields
 
+    # Fields that identify a component within its collection across refreshes.
+    # If empty, the whole (json) representation is used.
+    identity_fields: List[str] = []
+
+    # Seconds after which the data is considered stale and needs to be re-sourced
+    refresh_interval: float = 60
+
     def __init__(self,host=None, **kwargs):
         if not kwargs or not host:
             return
@@ -47,6 +54,33 @@ class Component:
     def component_name(self):
         return self.__class__.__name__.lower()
 
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        if not self.identity_fields:
+            # `last_update` changes with every source(), it doesn't identify anything
+            return tuple(sorted((k, repr(v)) for (k, v) in self.comparable_fields().items()))
+        return tuple(getattr(self, field, None) for field in self.identity_fields)
+
+    def comparable_fields(self) -> Dict[str, Any]:
+        """
+        All loadable fields except `last_update`. Unset fields count as `None`, components
+        loaded by from_json() have all of them while source() might only set a few.
+        """
+        return {field: getattr(self, field, None) for field in self.loadable_fields
+                if field != 'last_update'}
+
+    def has_changed(self, other: 'Component') -> bool:
+        return self.comparable_fields() != other.comparable_fields()
+
+    def update_from(self, other: 'Component'):
+        """
+        Take over all loadable fields from `other` (in place). Fields that `other`
+        doesn't have are reset to `None`.
+        """
+        for field in self.loadable_fields:
+            self.__setattr__(field, getattr(other, field, None))
+        self._needs_refresh = False
+
     def to_json(self) -> dict:
         # to_json all fields that are in loadable_fields and are not None (reduces the clutter)
         return {field: value for (field, value) in self.__dict__.items()
@@ -78,7 +112,7 @@ class Component:
             print(f"{self.component_name} needs refresh. last_update is not set")
             return True
         if self.last_update:
-            if time.time() - self.last_update > 1:
+            if time.time() - self.last_update > self.refresh_interval:
                 print(f"{self.component_name} needs refresh. Stale time has passed")
                 return True
         return False
@@ -111,6 +145,8 @@ class Component:
 class DaemonDescription(Component):
 
     loadable_fields = ['daemon_id', 'daemon_type', 'etc'] + Component.loadable_base_fields
+    identity_fields = ['daemon_id']
+    refresh_interval = 10
 
     def __init__(self, **kwargs):
         super(DaemonDescription, self).__init__(**kwargs)
@@ -143,6 +179,8 @@ class DaemonDescription(Component):
 class Network(Component):
 
     loadable_fields = ['address', 'subnet'] + Component.loadable_base_fields
+    identity_fields = ['address']
+    refresh_interval = 300
 
     def __init__(self, **kwargs):
         super(Network, self).__init__(**kwargs)
@@ -151,6 +189,7 @@ class Network(Component):
 class Attribute(Component):
 
     loadable_fields = ['cpu', 'ram', 'os'] + Component.loadable_base_fields
+    refresh_interval = 3600
 
     def __init__(self, **kwargs):
         super(Attribute, self).__init__(**kwargs)
@@ -159,6 +198,8 @@ class Attribute(Component):
 class Device(Component):
 
     loadable_fields = ['path', 'rotational', 'model'] + Component.loadable_base_fields
+    identity_fields = ['path']
+    refresh_interval = 600
 
     def __init__(self, **kwargs):
         super(Device, self).__init__(**kwargs)
@@ -167,11 +208,30 @@ class Device(Component):
 class Config(Component):
 
     loadable_fields = ['foo', 'bar', 'baz'] + Component.loadable_base_fields
+    refresh_interval = 600
 
     def __init__(self, **kwargs):
         super(Config, self).__init__(**kwargs)
 
 
+class ComponentDelta:
+    """
+    The result of reconciling a `ComponentCollection` with a freshly sourced one.
+    """
+
+    def __init__(self, added=None, removed=None, modified=None):
+        self.added: List[Component] = added or []
+        self.removed: List[Component] = removed or []
+        self.modified: List[Component] = modified or []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return (f"<ComponentDelta added={len(self.added)} "
+                f"removed={len(self.removed)} modified={len(self.modified)}>")
+
+
 class ComponentCollection:
     """
     To have a common interface with `Component`. Now we can use
@@ -192,6 +252,7 @@ class ComponentCollection:
         if not components:
             components = []
         self.__components = components
+        self._subscribers: List[Callable[['ComponentCollection', ComponentDelta], None]] = []
 
     @property
     def component_name(self):
@@ -212,8 +273,7 @@ class ComponentCollection:
 
     @classmethod
     def from_json(cls, data, host):
-        cls.__components = [cls.base_component.from_json(c, host) for c in data]
-        return cls()
+        return cls([cls.base_component.from_json(c, host) for c in data])
 
     def save(self):
         """
@@ -245,6 +305,48 @@ class ComponentCollection:
             components.append(cls.base_component.source(hostname, daemon_data))
         return cls(components)
 
+    def subscribe(self, callback: Callable[['ComponentCollection', ComponentDelta], None]):
+        """
+        `callback(collection, delta)` is called whenever `reconcile` detected changes
+        """
+        self._subscribers.append(callback)
+
+    def reconcile(self, new: 'ComponentCollection') -> ComponentDelta:
+        """
+        Merge a re-sourced collection into this one.
+
+        Components are matched by their `identity`. Unchanged components are kept
+        as they are, changed ones are updated in place and only the difference
+        is passed on to the subscribers.
+
+        Components that share an identity (i.e. `path` is not set) are matched
+        in the order they were sourced. Surplus ones are added or removed, none
+        are dropped silently.
+        """
+        old_by_id: Dict[Tuple[Any, ...], List[Component]] = dict()
+        for c in self.__components:
+            old_by_id.setdefault(c.identity, []).append(c)
+        delta = ComponentDelta()
+        components = list()
+        for new_component in new:
+            candidates = old_by_id.get(new_component.identity)
+            if not candidates:
+                delta.added.append(new_component)
+                components.append(new_component)
+                continue
+            old_component = candidates.pop(0)
+            if old_component.has_changed(new_component):
+                delta.modified.append(old_component)
+            old_component.update_from(new_component)
+            components.append(old_component)
+        delta.removed = [c for candidates in old_by_id.values() for c in candidates]
+        self.__components = components
+        if delta:
+            print(f"{self.component_name} changed -> {delta}")
+            for callback in self._subscribers:
+                callback(self, delta)
+        return delta
+
     def needs_refresh(self):
         return any([c.needs_refresh for c in self.__components])
 
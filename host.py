@@ -1,5 +1,7 @@
+import time
 from typing import *
 from store import Store
+from mgr import CephadmError
 from components import Networks, Devices, Attributes, DaemonDescriptions, Configs, ComponentCollection
 
 STORABLE_COMPONENTS_MAP = {'networks': Networks,
@@ -9,6 +11,65 @@ STORABLE_COMPONENTS_MAP = {'networks': Networks,
                            'daemons': DaemonDescriptions}
 
 
+class HostHealth:
+    """
+    Tracks how well refreshing a host works.
+
+    A failing host is not retried on every `serve()` tick. The time until the
+    next attempt doubles with every consecutive failure (up to `max_backoff`).
+    The latency is tracked as an exponentially weighted moving average which
+    is used to refresh slow hosts after the fast ones.
+    """
+
+    def __init__(self, base_backoff: float = 2, max_backoff: float = 300, alpha: float = 0.3):
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.alpha = alpha
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.next_attempt: float = 0
+
+    @property
+    def backoff(self) -> float:
+        if not self.consecutive_failures:
+            return 0
+        return min(self.base_backoff * 2 ** (self.consecutive_failures - 1), self.max_backoff)
+
+    def should_refresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) >= self.next_attempt
+
+    def record_success(self, latency: Optional[float] = None):
+        """
+        `latency` is only passed if a command actually ran on the host. Refreshes
+        that had nothing to do would otherwise pull the average towards zero.
+        """
+        self.last_success = time.time()
+        self.consecutive_failures = 0
+        self.next_attempt = 0
+        if latency is not None:
+            self.record_latency(latency)
+
+    def record_failure(self):
+        self.last_failure = time.time()
+        self.consecutive_failures += 1
+        self.next_attempt = self.last_failure + self.backoff
+
+    def record_latency(self, latency: float):
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+
+    def to_json(self) -> dict:
+        return dict(last_success=self.last_success,
+                    last_failure=self.last_failure,
+                    consecutive_failures=self.consecutive_failures,
+                    latency_ewma=self.latency_ewma,
+                    next_attempt=self.next_attempt)
+
+
 class Host:
     """
     The Host class has instances of `storable_components` loaded dynamically.
@@ -33,6 +94,7 @@ class Host:
         # end static init
 
         self.store = Store(self.mgr)
+        self.health = HostHealth()
 
     def online_daemons(self):
         return [x for x in self.daemons if x.running is True]
@@ -67,17 +129,49 @@ class Host:
         self.store.save(component.namespace(self.hostname), component.to_json())
 
     def refresh(self):
+        """
+        Refresh the components unless the host is backing off from earlier failures.
+        """
+        if not self.health.should_refresh():
+            print(f"Skipping refresh of <{self.hostname}>, backing off for "
+                  f"{self.health.next_attempt - time.time():.1f}s")
+            return
+        try:
+            latency = self._refresh_components()
+        except CephadmError as e:
+            self.health.record_failure()
+            print(f"Refreshing <{self.hostname}> failed ({self.health.consecutive_failures} in a row): {e}")
+            return
+        self.health.record_success(latency)
+
+    def _refresh_components(self) -> Optional[float]:
+        """
+        Returns how long the commands that actually ran on the host took, `None` if none did.
+        """
+        latency: Optional[float] = None
+        # Cached results are only shared within one refresh. Anything older
+        # would be stamped with a fresh `last_update` by source().
+        self.mgr.result_cache.invalidate(self.hostname)
         for component in self.inventory_blueprints:
             # If a host is getting added and there is no existing
             # data in the mon_store, source it!
             old_component = self.__getattribute__(component().component_name)
-            if old_component.needs_refresh():
-                data: List[Dict[str, str]] = self.mgr.run_cephadm(f'cephadm run ceph-volume inventory on host {host.hostname}')
+            if old_component is None or old_component.needs_refresh():
+                data, ran = self.mgr.run_cephadm_timed(
+                    f'cephadm run ceph-volume inventory on host {self.hostname}', self.hostname)
+                if ran is not None:
+                    latency = (latency or 0) + ran
                 component_obj = component.source(self.hostname, data=data)
-                self.__setattr__(component_obj.component_name, component_obj)
-                self.save_to_store(component_obj)
+                if old_component is None:
+                    self.__setattr__(component_obj.component_name, component_obj)
+                    self.save_to_store(component_obj)
+                    continue
+                # Only touch what actually changed
+                if old_component.reconcile(component_obj):
+                    self.save_to_store(old_component)
             else:
                 print('No refresh required')
+        return latency
 
     def refresh_component(self):
         """
@@ -118,8 +212,9 @@ class Hosts:
     def __getitem__(self, item):
         return self.__hosts[item]
 
-    def append(self, host: Host):
-        host.refresh()
+    def append(self, host: Host, refresh=True):
+        if refresh:
+            host.refresh()
         self.__hosts.append(host)
 
     def remove(self, host):
@@ -1,5 +1,8 @@
+import time
+from typing import *
 from store import Store
 from host import Host, Hosts
+import view
 
 
 class Inventory:
@@ -15,14 +18,30 @@ class Inventory:
         self.store = Store(mgr, version=self.requested_version)
         # Instead of `List[Host]` add a `Hosts` to be uniform with Component(s)
         self.hosts = Hosts()
-        self.load_from_store()
+        # Generation of the last snapshot that was taken or restored
+        self.generation = 0
+        self.last_snapshot: Optional[float] = None
+        self.snapshot_interval = 30  # This can come from the module config
+        # Hosts were added or removed since the last snapshot
+        self._snapshot_dirty = False
+        self._snapshotted: Optional[Dict[str, Dict[str, Any]]] = None
+        # If set, the inventory is published as a read-only view for other processes
+        self.view_path: Optional[str] = None  # This can come from the module config
+        self.view_generation = 0
+        self._published: Optional[Dict[str, Dict[str, Any]]] = None
+        if not self.restore_snapshot():
+            self.load_from_store()
         self.load_from_source()
 
     def add_host(self, host: Host):
         self.hosts.append(host)
+        # A standby restoring an older snapshot would otherwise not know about this host.
+        # The snapshot is written by the next `maybe_save_snapshot()`.
+        self._snapshot_dirty = True
 
     def remove_host(self, host):
         self.hosts.remove(host)
+        self._snapshot_dirty = True
 
     def load_from_store(self):
         """
@@ -43,6 +62,86 @@ class Inventory:
 
         assert self.loaded_version == self.requested_version
 
+    def as_json(self) -> Dict[str, Dict[str, Any]]:
+        return {host.hostname: {component.component_name: component.to_json()
+                                for component in host.inventory_objects}
+                for host in self.hosts}
+
+    def publish_view(self):
+        """
+        Publish the inventory to `view_path` (see `view.InventoryView`).
+
+        A new generation is only written if the inventory changed.
+        """
+        if not self.view_path:
+            return
+        hosts = self.as_json()
+        if hosts == self._published:
+            return
+        if self._published is None:
+            # Continue after the generation of a previous mgr, readers that are
+            # already on that generation would not re-map otherwise
+            self.view_generation = max(self.view_generation, view.read_generation(self.view_path) or 0)
+        self.view_generation += 1
+        view.publish(self.view_path, self.view_generation, hosts)
+        self._published = hosts
+
+    def snapshot_namespace(self):
+        return "snapshot/inventory"
+
+    def save_snapshot(self):
+        """
+        Save the whole inventory as one blob.
+
+        On failover the standby mgr can restore from this with a single read
+        instead of loading each `inventory/<host>/<component>` namespace.
+        Every component keeps its `last_update`, so only data that is older
+        than the component's `refresh_interval` needs to be re-sourced.
+        """
+        hosts = self.as_json()
+        self.last_snapshot = time.time()
+        self._snapshot_dirty = False
+        if hosts == self._snapshotted:
+            print("Inventory unchanged, skipping snapshot")
+            return
+        self.generation += 1
+        snapshot = {
+            'version': self.requested_version,
+            'generation': self.generation,
+            'created': self.last_snapshot,
+            'hosts': hosts
+        }
+        self.store.save(self.snapshot_namespace(), snapshot)
+        self._snapshotted = hosts
+
+    def maybe_save_snapshot(self):
+        """
+        Called from `serve()`. Snapshots right away if hosts were added or removed,
+        otherwise every `snapshot_interval` seconds.
+        """
+        if (self._snapshot_dirty or self.last_snapshot is None
+                or time.time() - self.last_snapshot > self.snapshot_interval):
+            self.save_snapshot()
+
+    def restore_snapshot(self) -> bool:
+        """
+        Restore from the last snapshot. Returns `False` if there is no usable snapshot.
+        """
+        snapshot = self.store.load_one(self.snapshot_namespace())
+        if not snapshot or snapshot.get('version') != self.requested_version:
+            print("No usable inventory snapshot found")
+            return False
+        self.generation = snapshot['generation']
+        self.loaded_version = snapshot['version']
+        self._snapshotted = snapshot['hosts']
+        print(f"Restoring inventory from snapshot generation <{self.generation}>")
+        for hostname, components in snapshot['hosts'].items():
+            host = Host(hostname=hostname, mgr=self.mgr)
+            host.populate_inventory_from_store(components)
+            # Stale components are refreshed by `load_from_source()` afterwards
+            self.hosts.append(host, refresh=False)
+        return True
+
     def load_from_source(self):
         """
         If any host is in the Inventory we attempt to refresh the data
@@ -50,10 +149,24 @@ class Inventory:
 
         Conditions:
         * if required (determined by component.needs_restart())
+        * if the host is not backing off from earlier failures
+
+        Fast hosts are refreshed first, hosts that never responded last.
         """
-        for host in self.hosts:
+        for host in sorted(self.hosts, key=lambda h: (h.health.latency_ewma is None,
+                                                      h.health.latency_ewma or 0)):
             host.refresh()
 
+    def host_health(self) -> Dict[str, Dict[str, Any]]:
+        return {host.hostname: host.health.to_json() for host in self.hosts}
+
+    def failing_hosts(self) -> List[Host]:
+        return [host for host in self.hosts if host.health.consecutive_failures]
+
+    def slow_hosts(self, threshold: float = 5) -> List[Host]:
+        return [host for host in self.hosts
+                if host.health.latency_ewma is not None and host.health.latency_ewma > threshold]
+
     def refresh(self):
         print(f"Triggering checks for refresh")
         self.load_from_source()
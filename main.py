@@ -6,6 +6,7 @@ from typing import *
 
 from inventory import Inventory
 from mgr import Mgr
+from store import SpecStore
 
 
 class Internal:
@@ -17,6 +18,9 @@ class Internal:
     """
     def __init__(self):
         self.mgr = Mgr()
+        self.spec_store = SpecStore(self.mgr)
+        # pre-load all specs on ceph-mgr startup
+        self.spec_store.preload()
         self.inventory = Inventory(mgr=self.mgr)
 
     def serve(self):
@@ -24,6 +28,8 @@ class Internal:
         while True:
             counter += 1
             self.inventory.refresh()
+            self.inventory.maybe_save_snapshot()
+            self.inventory.publish_view()
             for host in self.inventory.hosts:
                 for component in host.inventory_objects:
                     print(component.to_json())
@@ -1,4 +1,9 @@
+import json
 import pprint
+import threading
+import time
+from collections import OrderedDict
+from typing import *
 
 import yaml
 
@@ -13,6 +18,94 @@ store_struct = _load_inventory_struct()
 pp.pprint(store_struct)
 
 
+class CephadmError(Exception):
+    """
+    Running a command on a host failed (connection lost, non-zero exit code, ...)
+    """
+    pass
+
+
+class ResultCache:
+    """
+    Caches the output of commands that are run on a host (bin/cephadm i.e.).
+
+    Multiple components of a host are sourced from the same output. Within `ttl`
+    seconds the same command on the same host is only executed once. Callers
+    that ask for a result that is currently being computed wait for it
+    instead of running the command again.
+
+    Entries are evicted in LRU order once `max_bytes` (json encoded size) is exceeded.
+
+    `Host.refresh` invalidates the results of its host before it starts, so a result
+    is never served to a later refresh. `ttl` only bounds the lifetime within one.
+    """
+
+    def __init__(self, ttl: float = 10, max_bytes: int = 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # (host, cmd) -> (timestamp, size, result)
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[float, int, Any]]' = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], threading.Event] = dict()
+        self._lock = threading.Lock()
+
+    def get_or_run(self, host: str, cmd: str, func: Callable[[], Any]) -> Any:
+        key = (host, cmd)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() - entry[0] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                if entry is not None:
+                    self._drop(key)
+                event = self._inflight.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = self._inflight[key] = threading.Event()
+                    break
+            # Someone else is already running this command
+            event.wait()
+        try:
+            result = func()
+            self._put(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def invalidate(self, host: str, cmd: Optional[str] = None):
+        """
+        Drop the cached results of `host` (after deploying a daemon i.e.)
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == host and cmd in (None, k[1])]:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(hits=self.hits, misses=self.misses,
+                    entries=len(self._entries), bytes=self.size)
+
+    def _put(self, key, result):
+        size = len(json.dumps(result))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                print(f"Not caching result of <{key[1]}> on <{key[0]}>, too large ({size} bytes)")
+                return
+            self._entries[key] = (time.time(), size, result)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        self.size -= self._entries.pop(key)[1]
+
+
 class Mgr:
     """
     This is the MgrModule that implements interaction with the mgr-daemon, the mon store
@@ -26,7 +119,14 @@ class Mgr:
     * ... and more
 
     """
+    def __init__(self):
+        # Stand-in for the key-value part of the mon_store
+        self._store: Dict[str, str] = dict()
+        self.result_cache = ResultCache()
+
     def get_store_prefix(self, namespace=None, version=None):
+        if namespace and namespace.startswith('spec.'):
+            return {k: v for k, v in self._store.items() if k.startswith(namespace)}
         if version == 1:
             return {
                 "cephadm-dev": {
@@ -45,15 +145,49 @@ class Mgr:
         if version == 2:
             return _load_inventory_struct()
 
+    def get_store(self, namespace, version=None) -> Optional[str]:
+        return self._store.get(namespace)
+
     def set_store(self, namespace, data, version=None):
         """
         This is the raw dump of the data into the mon_store
+
+        Passing `data=None` removes the key.
         """
-        assert data
         assert namespace
-        pass
+        if data is None:
+            self._store.pop(namespace, None)
+            return True
+        self._store[namespace] = data
+        return True
+
+    def run_cephadm(self, cmd, host=None):
+        """
+        Results are cached per host and command, see `ResultCache`.
+
+        raises `CephadmError` if the host can't be reached or the command fails
+        """
+        if host is None:
+            return self._run_cephadm(cmd)
+        return self.run_cephadm_timed(cmd, host)[0]
+
+    def run_cephadm_timed(self, cmd, host) -> Tuple[Any, Optional[float]]:
+        """
+        Like `run_cephadm`, but also returns how long the command took. The latency
+        is `None` if this call didn't run the command itself (cached or in-flight).
+        """
+        latency: List[float] = []
+
+        def run():
+            start = time.time()
+            result = self._run_cephadm(cmd)
+            latency.append(time.time() - start)
+            return result
+
+        result = self.result_cache.get_or_run(host, cmd, run)
+        return result, latency[0] if latency else None
 
-    def run_cephadm(self, cmd):
+    def _run_cephadm(self, cmd):
         return [
             {
                 'daemon_id': 'mon.1',
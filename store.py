@@ -1,3 +1,4 @@
+import copy
 import json
 from typing import *
 
@@ -67,7 +68,128 @@ class Store:
         for k, v in self.mgr.get_store_prefix(namespace, version=self.version).items():
             yield k, v
 
+    def load_one(self, namespace) -> Optional[Any]:
+        """
+        Load a single key from the mon_store, `None` if it doesn't exist.
+        """
+        blob = self.mgr.get_store(namespace, version=self.version)
+        if blob is None:
+            return None
+        return json.loads(blob)
+
     def migrate(self, from_v, to_v):
         # TODO!
         assert from_v > to_v
 
+
+
+class SpecStore(Store):
+    """
+    Keeps the specs that are saved with `spec.type.name` in the mon_store.
+
+    The specs are pre-loaded on ceph-mgr startup into an in-memory index that is
+    keyed by `service_type` and `service_name`. The index only holds the raw
+    (still json encoded) blobs. Decoding (and migrating) happens lazily on the
+    first access of a spec, listing specs only looks at the index.
+
+    Example:
+
+    `self.spec_store.save_spec({'service_type': 'mon', 'service_name': 'mon'})`
+    `self.spec_store.get('mon', 'mon')`
+    `self.spec_store.names('mon')`
+
+    Writes are write-through. The index and the mon_store are updated in one go.
+    `get()` returns a copy, changing it doesn't change the index. Use `save_spec()`.
+    """
+
+    prefix = 'spec'
+
+    def __init__(self, mgr, version=1):
+        super(SpecStore, self).__init__(mgr, namespace=self.prefix, version=version)
+        # service_type -> service_name -> raw blob
+        self._raw: Dict[str, Dict[str, str]] = dict()
+        # service_type -> service_name -> decoded blob
+        self._decoded: Dict[str, Dict[str, Dict[str, Any]]] = dict()
+        # migrations from `version` to `version + 1`
+        self.migrations: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = dict()
+
+    def key(self, service_type: str, service_name: Optional[str] = None) -> str:
+        if service_name is None:
+            return f"{self.prefix}.{service_type}."
+        return f"{self.prefix}.{service_type}.{service_name}"
+
+    def preload(self, service_type: Optional[str] = None):
+        """
+        Populate the index from the mon_store.
+
+        If `service_type` is given only the specs below `spec.service_type.` are
+        loaded. That allows loading parts of the specs without touching the others.
+        """
+        namespace = self.key(service_type) if service_type else f"{self.prefix}."
+        for key, blob in self.load(namespace):
+            _, s_type, s_name = key.split('.', 2)
+            self._raw.setdefault(s_type, dict())[s_name] = blob
+            self._decoded.get(s_type, dict()).pop(s_name, None)
+        print(f"Loaded specs for namespace -> {namespace}")
+
+    def types(self) -> List[str]:
+        return list(self._raw.keys())
+
+    def names(self, service_type: str) -> List[str]:
+        return list(self._raw.get(service_type, dict()).keys())
+
+    def get(self, service_type: str, service_name: str) -> Optional[Dict[str, Any]]:
+        decoded = self._decoded.get(service_type, dict())
+        if service_name not in decoded:
+            blob = self._raw.get(service_type, dict()).get(service_name)
+            if blob is None:
+                return None
+            decoded = self._decoded.setdefault(service_type, dict())
+            decoded[service_name] = self.migrate_spec(json.loads(blob))
+        return copy.deepcopy(decoded[service_name])
+
+    def save_spec(self, spec: Dict[str, Any] = None, **kwargs) -> bool:
+        """
+        Save a spec to the index and to the mon_store (write-through).
+
+        `spec` is the plain spec (must contain `service_type` and `service_name`),
+        everything in `kwargs` is stored next to it (created_at i.e.).
+        """
+        assert spec
+        s_type = spec['service_type']
+        s_name = spec['service_name']
+        blob = self.jsonify(dict(spec=spec, version=self.version, **kwargs))
+        if self._raw.get(s_type, dict()).get(s_name) == blob:
+            print(f"No changes for spec -> {self.key(s_type, s_name)}")
+            return True
+        ret = self.mgr.set_store(self.key(s_type, s_name), blob, version=self.version)
+        self._raw.setdefault(s_type, dict())[s_name] = blob
+        # Cache what was encoded, not the caller's dict
+        self._decoded.setdefault(s_type, dict())[s_name] = json.loads(blob)
+        return ret
+
+    def remove(self, service_type: str, service_name: str):
+        self.mgr.set_store(self.key(service_type, service_name), None, version=self.version)
+        for index in (self._raw, self._decoded):
+            index.get(service_type, dict()).pop(service_name, None)
+            # Don't keep listing a type without specs in `types()`
+            if service_type in index and not index[service_type]:
+                del index[service_type]
+
+    def migrate_spec(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Bring a spec that was stored with an older version up to `self.version`
+        and write the result back to the mon_store.
+        """
+        loaded_version = data.get('version', 1)
+        if loaded_version == self.version:
+            return data
+        assert loaded_version < self.version
+        for v in range(loaded_version, self.version):
+            print(f"Migrating spec from version <{v}> to <{v + 1}>")
+            data = self.migrations[v](data)
+            data['version'] = v + 1
+        spec = data.pop('spec')
+        data.pop('version')
+        self.save_spec(spec, **data)
+        return self._decoded[spec['service_type']][spec['service_name']]
@@ -0,0 +1,157 @@
+"""
+A read-only view of the inventory for other processes on the same node.
+
+The orchestrator publishes the inventory into a file with the following layout:
+
+    | magic | version | generation | index length | index (json) | component blobs (json) |
+
+The index maps `host -> component -> (offset, length)` of the respective blob.
+Readers mmap the file and only decode the components they actually look at.
+A new generation is written to a temporary file which then replaces the old one,
+readers that still have the old file mapped keep a consistent view until they `refresh()`.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import *
+
+MAGIC = b'CINV'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIQI')
+
+
+def publish(path: str, generation: int, hosts: Dict[str, Dict[str, Any]]):
+    """
+    Write `hosts` (hostname -> component_name -> json data) to `path`.
+    """
+    index: Dict[str, Dict[str, Tuple[int, int]]] = dict()
+    blobs = list()
+    offset = 0
+    for hostname, components in hosts.items():
+        for component_name, data in components.items():
+            blob = json.dumps(data).encode()
+            index.setdefault(hostname, dict())[component_name] = (offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+    index_blob = json.dumps(index).encode()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as _fd:
+        _fd.write(HEADER.pack(MAGIC, FORMAT_VERSION, generation, len(index_blob)))
+        _fd.write(index_blob)
+        for blob in blobs:
+            _fd.write(blob)
+    os.replace(tmp_path, path)
+    print(f"Published inventory generation <{generation}> to {path}")
+
+
+def read_generation(path: str) -> Optional[int]:
+    """
+    The generation of the file at `path`, `None` if nothing was published yet.
+    """
+    try:
+        with open(path, 'rb') as _fd:
+            magic, version, generation, _ = HEADER.unpack(_fd.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    return generation
+
+
+class InventoryView:
+    """
+    Read-only access to a published inventory.
+
+    `view.get('host_a', 'daemons')` only decodes that one component.
+    Call `refresh()` to pick up a newer generation, it's a no-op otherwise.
+
+    The memoryviews returned by `raw()` point into the mapping of the generation
+    they were taken from and stay valid after a `refresh()`. That mapping is only
+    closed once all of its views are released (`view.release()` or a `with` block),
+    checked on the next `refresh()` or `close()`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.generation: Optional[int] = None
+        self._fd = None
+        self._map: Optional[mmap.mmap] = None
+        # Mappings of older generations that still have views handed out
+        self._retired: List[Tuple[Any, mmap.mmap]] = []
+        self._index: Dict[str, Dict[str, List[int]]] = dict()
+        self._data_offset = 0
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Re-map the file if a new generation was published. Returns `True` if it did.
+        """
+        with open(self.path, 'rb') as _fd:
+            _, _, generation, _ = self._read_header(_fd.read(HEADER.size))
+        if self._map is not None and generation != self.generation:
+            self._retired.append((self._fd, self._map))
+        self._release_retired()
+        if generation == self.generation:
+            return False
+        self._fd = open(self.path, 'rb')
+        self._map = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, self.generation, index_len = self._read_header(self._map[:HEADER.size])
+        self._index = json.loads(self._map[HEADER.size:HEADER.size + index_len])
+        self._data_offset = HEADER.size + index_len
+        print(f"Mapped inventory generation <{self.generation}>")
+        return True
+
+    @staticmethod
+    def _read_header(raw: bytes):
+        magic, version, generation, index_len = HEADER.unpack(raw)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise Exception(f"Unsupported inventory view format <{magic}, {version}>")
+        return magic, version, generation, index_len
+
+    def hosts(self) -> List[str]:
+        return list(self._index.keys())
+
+    def components(self, hostname: str) -> List[str]:
+        return list(self._index.get(hostname, dict()).keys())
+
+    def raw(self, hostname: str, component_name: str) -> Optional[memoryview]:
+        """
+        The json encoded component without copying it out of the mapping
+        """
+        entry = self._index.get(hostname, dict()).get(component_name)
+        if entry is None:
+            return None
+        offset, length = entry
+        start = self._data_offset + offset
+        return memoryview(self._map)[start:start + length]
+
+    def get(self, hostname: str, component_name: str) -> Optional[Any]:
+        blob = self.raw(hostname, component_name)
+        if blob is None:
+            return None
+        with blob:
+            return json.loads(blob.tobytes())
+
+    def _release_retired(self):
+        still_used = list()
+        for _fd, _map in self._retired:
+            try:
+                _map.close()
+            except BufferError:
+                # There are still views from `raw()` around
+                still_used.append((_fd, _map))
+                continue
+            _fd.close()
+        self._retired = still_used
+
+    def close(self):
+        """
+        Closes the current mapping and every older one that has no views left
+        """
+        if self._map is not None:
+            self._retired.append((self._fd, self._map))
+        self._map = None
+        self._fd = None
+        self._release_retired()